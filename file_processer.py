@@ -1,74 +1,250 @@
+import asyncio
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from logging_config import logger
-from typing import Any
-from utilities import config
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from langchain.schema import Document
+from openai import OpenAI
+from utilities import config, build_text_chunker
 from pdf_processing import process_pdf
 from word_processing import process_word_text
 from txt_processing import process_text
+from vector_database import DocumentBatcher
 
-def process_all_files(data_folder: str, vector_db: Any, openai_client: Any, model_name: str, text_chunker: Any) -> None:
+# OpenAI client and text chunker owned by the current worker process, created by _init_worker
+_worker_openai_client = None
+_worker_text_chunker = None
+
+def _init_worker(chunker_config: dict, log_queue: Any) -> None:
+    """
+    Initializes a worker process with its own OpenAI client and text chunker.
+
+    Clients are not shared with the parent process because their connection pools are not fork-safe.
+    The text chunker is built once per worker so its separator patterns are compiled only once.
+    Log records are sent to the parent process, which is the only process writing the rotating log file.
+
+    Args:
+        chunker_config (dict): The text splitter settings used to build the text chunker.
+        log_queue (Any): The multiprocessing queue the parent process reads log records from.
+    """
+    global _worker_openai_client, _worker_text_chunker
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+    _worker_openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    _worker_text_chunker = build_text_chunker(chunker_config)
+
+def _process_pdf_file(file_path: str, output_folder: str, batcher: DocumentBatcher, openai_client: Any, model_name: str, text_chunker: Any) -> None:
+    """Adapts process_pdf to the common file handler signature."""
+    process_pdf(file_path, output_folder, batcher, openai_client, model_name, text_chunker)
+
+def _process_txt_file(file_path: str, output_folder: str, batcher: DocumentBatcher, openai_client: Any, model_name: str, text_chunker: Any) -> None:
+    """Adapts process_text to the common file handler signature."""
+    process_text(file_path, batcher, text_chunker)
+
+def _process_word_file(file_path: str, output_folder: str, batcher: DocumentBatcher, openai_client: Any, model_name: str, text_chunker: Any) -> None:
+    """Adapts process_word_text to the common file handler signature."""
+    process_word_text(file_path, batcher, text_chunker)
+
+# Maps each supported file extension to its file type label and processing function
+FILE_HANDLERS: Dict[str, Tuple[str, Callable[..., None]]] = {
+    '.pdf': ("PDF", _process_pdf_file),
+    '.txt': ("TXT", _process_txt_file),
+    '.docx': ("Word", _process_word_file),
+}
+
+# Leading bytes of each binary file type, used to skip mislabeled files before processing
+FILE_SIGNATURES: Dict[str, bytes] = {
+    '.pdf': b'%PDF',
+    '.docx': b'PK\x03\x04',
+}
+
+def _is_processable(entry: os.DirEntry, extension: str) -> bool:
+    """
+    Checks that a file is non-empty and its content matches its extension, logging why it is skipped otherwise.
+
+    Args:
+        entry (os.DirEntry): The directory entry of the file.
+        extension (str): The lowercase extension of the file.
+
+    Returns:
+        bool: True if the file should be processed.
+    """
+    try:
+        if entry.stat().st_size == 0:
+            logger.warning("Skipping empty file: %s", entry.name)
+            return False
+
+        signature = FILE_SIGNATURES.get(extension)
+        if signature:
+            with open(entry.path, 'rb') as file:
+                if file.read(len(signature)) != signature:
+                    logger.warning("Skipping file whose content does not match its extension: %s", entry.name)
+                    return False
+    except OSError as e:
+        logger.warning("Skipping unreadable file %s: %s", entry.name, e)
+        return False
+    return True
+
+def _process_one(file_path: str, output_folder: str, model_name: str) -> List[Tuple[str, dict]]:
+    """
+    Extracts and chunks a single file inside a worker process.
+
+    Args:
+        file_path (str): The path to the file to process.
+        output_folder (str): The folder where extracted images will be saved.
+        model_name (str): The name of the OpenAI model to use for generating summaries.
+
+    Returns:
+        List[Tuple[str, dict]]: The text and metadata of every document extracted from the file.
+    """
+    filename = os.path.basename(file_path)
+    file_type, handler = FILE_HANDLERS[os.path.splitext(filename)[1].lower()]
+    batcher = DocumentBatcher()
+
+    logger.info("Processing %s file: %s", file_type, filename)
+    handler(file_path, output_folder, batcher, _worker_openai_client, model_name, _worker_text_chunker)
+
+    return [(document.page_content, document.metadata) for document in batcher.documents]
+
+async def _extract_file(executor: ProcessPoolExecutor, file_path: str, output_folder: str, model_name: str) -> Tuple[str, Optional[List[Tuple[str, dict]]]]:
+    """
+    Runs _process_one for a file in the process pool and logs any failure.
+
+    Args:
+        executor (ProcessPoolExecutor): The process pool running the extraction.
+        file_path (str): The path to the file to process.
+        output_folder (str): The folder where extracted images will be saved.
+        model_name (str): The name of the OpenAI model to use for generating summaries.
+
+    Returns:
+        Tuple[str, Optional[List[Tuple[str, dict]]]]: The file name and its documents, or None if processing failed.
+    """
+    filename = os.path.basename(file_path)
+    loop = asyncio.get_running_loop()
+    try:
+        results = await loop.run_in_executor(executor, _process_one, file_path, output_folder, model_name)
+    except Exception as e:
+        # The processing modules wrap library errors in plain Exception, so one corrupt file is logged rather than ending the ingest
+        logger.error("Error processing file %s: %s", filename, e)
+        return filename, None
+    return filename, results
+
+async def _extractor_worker(executor: ProcessPoolExecutor, max_workers: int, file_paths: List[str], output_folder: str, model_name: str, chunk_queue: asyncio.Queue) -> None:
+    """
+    Extracts files in the process pool and puts the documents of each file on the queue as soon as it finishes.
+
+    At most max_workers plus the queue size files are extracted or waiting to be queued at once,
+    and a file holds its slot until its documents are on the queue, so a full queue stops new files
+    from being submitted to the pool. Puts None on the queue once every file has been handled.
+
+    Args:
+        executor (ProcessPoolExecutor): The process pool running the extraction.
+        max_workers (int): The number of worker processes in the pool.
+        file_paths (List[str]): The paths to the files to process.
+        output_folder (str): The folder where extracted images will be saved.
+        model_name (str): The name of the OpenAI model to use for generating summaries.
+        chunk_queue (asyncio.Queue): The queue of (file name, documents) pairs shared with the embedder.
+    """
+    slots = asyncio.Semaphore(max_workers + chunk_queue.maxsize)
+
+    async def _extract_and_queue(file_path: str) -> None:
+        async with slots:
+            filename, results = await _extract_file(executor, file_path, output_folder, model_name)
+            if results is not None:
+                await chunk_queue.put((filename, results))
+
+    try:
+        await asyncio.gather(*[_extract_and_queue(file_path) for file_path in file_paths])
+    finally:
+        await chunk_queue.put(None)
+
+async def _embedder_worker(batcher: DocumentBatcher, chunk_queue: asyncio.Queue) -> None:
+    """
+    Takes the documents of each extracted file off the queue and hands them to the batcher until None is received.
+
+    Args:
+        batcher (DocumentBatcher): The batcher that embeds and inserts the documents.
+        chunk_queue (asyncio.Queue): The queue of (file name, documents) pairs shared with the extractor.
+    """
+    while True:
+        item = await chunk_queue.get()
+        if item is None:
+            break
+        filename, results = item
+        batcher.extend([Document(page_content=text, metadata=metadata) for text, metadata in results])
+        await batcher.flush_if_full()
+        logger.info("Processed file: %s", filename)
+
+    # Insert the documents remaining in the buffer and wait for all pending inserts
+    await batcher.flush()
+
+async def process_all_files(data_folder: str, vector_db: Any, openai_client: Any, model_name: str, chunker_config: dict) -> None:
     """
     Processes all PDF, TXT, and Word files in the specified data folder.
 
+    Files are extracted in parallel worker processes; the resulting documents are
+    embedded and inserted into the vector database in batches by the parent process.
+    Extraction and embedding are connected by a bounded queue, so embedding of finished
+    files overlaps with the extraction of the remaining ones.
+
     Args:
         data_folder (str): The path to the folder containing files.
         vector_db (Any): An instance of the vector database to which documents will be added.
-        openai_client (Any): An instance of the OpenAI client to interact with the API.
+        openai_client (Any): An instance of the asynchronous OpenAI client used to embed the documents.
         model_name (str): The name of the OpenAI model to use for generating summaries.
-        text_chunker (Any): An instance of the text splitter to use for splitting text.
+        chunker_config (dict): The text splitter settings used to build the text chunker.
     """
 
     # Check if the data folder exists
     if not os.path.exists(data_folder):
-        logger.error(f"The specified data folder does not exist: {data_folder}")
-        print(f"Error: The specified data folder does not exist: {data_folder}")
+        logger.error("The specified data folder does not exist: %s", data_folder)
         return
 
-    # Create the output folder for extracted images
+    # Create the output folder for extracted images next to the data folder, so it is not scanned as input
     extracted_images_foldername = config["settings"].get("image_directory_name", "extracted_images") or "extracted_images"
-    output_folder = os.path.join(data_folder, extracted_images_foldername)
+    output_folder = os.path.join(os.path.dirname(os.path.abspath(data_folder)), extracted_images_foldername)
     os.makedirs(output_folder, exist_ok=True)
 
-    files = os.listdir(data_folder)
-    if not files:
+    with os.scandir(data_folder) as it:
+        entries = [entry for entry in it if entry.is_file()]
+    if not entries:
         logger.warning("No files found in the specified data folder.")
-        print("Warning: No files found in the specified data folder.")
         return
 
-    # Iterate through all files in the data folder
-    for filename in files:
-        file_path = os.path.join(data_folder, filename)
-
-        try:
-            if filename.lower().endswith('.pdf'):
-                logger.info(f"Processing PDF file: {filename}")
-                print(f"Processing PDF file: {filename}")
-                process_pdf(file_path, output_folder, vector_db, openai_client, model_name, text_chunker)
-                logger.info(f"Processed PDF file: {filename}")
-                print(f"Processed PDF file: {filename}")
-
-            elif filename.lower().endswith('.txt'):
-                logger.info(f"Processing TXT file: {filename}")
-                print(f"Processing TXT file: {filename}")
-                process_text(file_path, vector_db, text_chunker)
-                logger.info(f"Processed TXT file: {filename}")
-                print(f"Processed TXT file: {filename}")
-
-            elif filename.lower().endswith('.docx'):
-                logger.info(f"Processing Word file: {filename}")
-                print(f"Processing Word file: {filename}")
-                process_word_text(file_path, vector_db, text_chunker)
-                logger.info(f"Processed Word file: {filename}")
-                print(f"Processed Word file: {filename}")
-
-            else:
-                if config["settings"]["image_directory_name"] != filename:
-                    logger.warning(f"Unsupported file type: {filename}")
-                    print(f"Warning: Unsupported file type: {filename}")
-
-        except Exception as e:
-            logger.error(f"Error processing file {filename}: {e}")
-            print(f"Error processing file {filename}: {e}")
+    # Collect the supported files to process
+    file_paths = []
+    for entry in entries:
+        extension = os.path.splitext(entry.name)[1].lower()
+        if extension not in FILE_HANDLERS:
+            logger.warning("Unsupported file type: %s", entry.name)
+        elif _is_processable(entry, extension):
+            file_paths.append(entry.path)
+
+    # Buffer documents across files so they are inserted in batches
+    batch_size = config["VectorDB"].get("batch_size", 200) or 200
+    embedding_model_name = config["VectorDB"]["embedding_model_name"]
+    max_concurrency = config["VectorDB"].get("embedding_concurrency", 12) or 12
+    batcher = DocumentBatcher(vector_db, openai_client, embedding_model_name, batch_size=batch_size, max_concurrency=max_concurrency)
+    max_workers = config["settings"].get("max_workers") or os.cpu_count()
+    chunk_queue = asyncio.Queue(maxsize=config["settings"].get("chunk_queue_size", 4) or 4)
+
+    # Write the log records of the worker processes through the handlers of this process
+    log_queue = multiprocessing.Queue()
+    log_listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    log_listener.start()
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(chunker_config, log_queue)) as executor:
+            extractor = asyncio.create_task(_extractor_worker(executor, max_workers, file_paths, output_folder, model_name, chunk_queue))
+            try:
+                await _embedder_worker(batcher, chunk_queue)
+            finally:
+                # Stop extracting further files if embedding failed
+                extractor.cancel()
+                await asyncio.gather(extractor, return_exceptions=True)
+    finally:
+        log_listener.stop()
 
     logger.info("All files have been processed.")
-    print("All files have been processed.")
\ No newline at end of file
@@ -1,13 +1,14 @@
 import os
+import sys
+import asyncio
 from typing import Collection
-import pandas as pd
-from openai import OpenAI
+import openpyxl
+from openai import AsyncOpenAI, OpenAI
 import logging
 from logging.handlers import RotatingFileHandler
-from langchain_community.vectorstores import Chroma
+import chromadb
 from langchain_openai import OpenAIEmbeddings
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from vector_database import create_retriever
+from vector_database import create_retriever, apply_sqlite_pragmas, ChromaVectorStore, FaissVectorStore
 from model_interaction import generate_answer_from_vector_db
 from logging_config import logger
 from utilities import config
@@ -16,6 +17,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Show log records on the console as well as in the log file
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setLevel(logging.INFO)
+console_handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+logger.addHandler(console_handler)
+
 def initialize_openai_client():
     """
     Initialize the OpenAI client.
@@ -27,68 +34,114 @@ def initialize_openai_client():
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
     return client
 
+def initialize_async_openai_client():
+    """
+    Initialize the asynchronous OpenAI client used to embed documents during ingestion.
+
+    Returns:
+        AsyncOpenAI: Initialized asynchronous OpenAI client.
+    """
+    load_dotenv()
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return client
+
 def initialize_vector_db(embedding_model_name, db_collection_name, vector_db_persist_directory):
     """
     Initialize the vector database.
 
+    The backend is chosen by the "backend" setting of the VectorDB config: "chroma" (the default)
+    or "faiss" for large corpora. Setting "quantization" to "int8" stores FAISS vectors as 8-bit
+    scalar-quantized codes; Chroma always stores float32 vectors.
+
     Args:
         embedding_model_name (str): Name of the embedding model.
         db_collection_name (str): Name of the database collection.
         vector_db_persist_directory (str): Directory to persist the vector database.
 
     Returns:
-        Chroma: Initialized vector database.
+        ChromaVectorStore or FaissVectorStore: Initialized vector database.
     """
     embedding_function = OpenAIEmbeddings(api_key=os.getenv("OPENAI_API_KEY"), model=embedding_model_name)
-    vector_db = Chroma(
+    backend = config['VectorDB'].get("backend", "chroma") or "chroma"
+    quantization = config['VectorDB'].get("quantization")
+    if quantization not in (None, "int8"):
+        raise ValueError(f"Unsupported embedding quantization: {quantization}")
+    if backend == "faiss":
+        # IVF with 8-bit scalar quantized codes stores one byte per dimension
+        default_index_factory = "IVF4096,SQ8" if quantization == "int8" else "IVF4096,PQ64"
+        return FaissVectorStore.load_or_create(
+            embedding_function,
+            persist_directory=os.path.join(vector_db_persist_directory, db_collection_name),
+            index_factory=config['VectorDB'].get("faiss_index_factory", default_index_factory) or default_index_factory,
+            fallback_index_factory="SQ8" if quantization == "int8" else "Flat",
+            train_size=config['VectorDB'].get("faiss_train_size", 100000) or 100000,
+            nprobe=config['VectorDB'].get("faiss_nprobe", 16) or 16
+        )
+    if backend != "chroma":
+        raise ValueError(f"Unsupported vector database backend: {backend}")
+    if quantization:
+        logger.warning("Embedding quantization is only supported by the FAISS backend; Chroma stores float32 vectors.")
+
+    client = chromadb.PersistentClient(path=vector_db_persist_directory)
+    apply_sqlite_pragmas(client)
+    vector_db = ChromaVectorStore(
+        client=client,
         collection_name=db_collection_name,
-        embedding_function=embedding_function,
-        persist_directory=vector_db_persist_directory
+        embedding_function=embedding_function
     )
     return vector_db
 
-def log_to_excel(data, output_folder,output_excel_file_name):
+def open_log_workbook(excelfile_full_path):
     """
-    Log the question, response, and references to an Excel file.
+    Open the Excel workbook that questions, responses, and references are logged to.
 
     Args:
-        data (list): List of dictionaries containing question, response, and references.
-        output_folder (str) : Contains the name of the output folder.
-        output_excel_file_name (str): Name of the output Excel file.
+        excelfile_full_path (str): Path to the output Excel file. A new workbook with a header row is created if it does not exist.
+
+    Returns:
+        tuple: The openpyxl workbook and the worksheet to append rows to.
+    """
+    if os.path.exists(excelfile_full_path):
+        workbook = openpyxl.load_workbook(excelfile_full_path)
+        worksheet = workbook["Sheet1"] if "Sheet1" in workbook.sheetnames else workbook.active
+    else:
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = "Sheet1"
+        worksheet.append(["Question", "Response", "References"])
+    return workbook, worksheet
+
+def install_uvloop():
+    """
+    Use uvloop for the asyncio event loop if it is installed, otherwise keep the default loop.
     """
-    if not data:
-        logger.warning("No data to log.")
-        return
-    # Convert data to a DataFrame
-    df = pd.DataFrame(data)
     try:
-        #creating the output folder is not exists
-        if not os.path.exists(output_folder):
-            os.makedirs(output_folder)
-        
-        excelfile_full_path = os.path.join(output_folder,output_excel_file_name)
-        # Check if the output file already exists
-        if os.path.exists(excelfile_full_path):
-            # Append dasta to existing Excel file
-            with pd.ExcelWriter(excelfile_full_path, mode='a', engine='openpyxl', if_sheet_exists='overlay') as writer:
-                # Determine the starting row for appending
-                start_row = writer.sheets['Sheet1'].max_row
-                df.to_excel(writer, index=False, header=False, startrow=start_row)
-                logger.info(f"Appended data to {output_excel_file_name}.")
-                print(f"Appended results to {output_excel_file_name}.")
-        else:
-            # Create a new Excel file and save data
-            with pd.ExcelWriter(excelfile_full_path, mode='w', engine='openpyxl') as writer:
-                df.to_excel(writer, index=False)
-                logger.info(f"Created new file and saved results to {output_excel_file_name}.")
-                print(f"Created new file and saved results to {output_excel_file_name}.")
-    except Exception as e:
-        logger.error(f"Error logging data to Excel: {e}")
+        import uvloop
+    except ImportError:
+        logger.info("uvloop is not installed; using the default asyncio event loop.")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using the uvloop event loop.")
+
+async def ingest_files(data_folder, vector_db, model_name):
+    """
+    Process all files in the data folder, embedding them with an asynchronous OpenAI client.
+
+    Args:
+        data_folder (str): The path to the folder containing files.
+        vector_db (ChromaVectorStore or FaissVectorStore): The vector database to which documents will be added.
+        model_name (str): The name of the OpenAI model to use for generating image summaries.
+    """
+    async with initialize_async_openai_client() as async_openai_client:
+        await process_all_files(data_folder, vector_db, async_openai_client, model_name, chunker_config=config["text_splitter"])
 
 def ask_question(retriever, openai_client, max_images, output_folder,output_excel_file_name):
     """
     Prompt user for questions and log responses.
 
+    The log workbook stays open for the whole session; each answer is appended as a row
+    and the workbook is saved once on exit.
+
     Args:
         retriever (object): Retriever instance for generating answers.
         openai_client (openai): Initialized OpenAI client.
@@ -96,26 +149,37 @@ def ask_question(retriever, openai_client, max_images, output_folder,output_exce
         output_folder (str) : Contains the name of the output folder.
         output_excel_file_name (str): Name of the output Excel file.
     """
-    log_data = []
-    while True:
-        question = input("Enter Question (or 'exit' to quit): ")
-        if question.lower() == 'exit':
-            break
+    # Create the output folder if it does not exist
+    os.makedirs(output_folder, exist_ok=True)
+    excelfile_full_path = os.path.join(output_folder, output_excel_file_name)
+    workbook, worksheet = open_log_workbook(excelfile_full_path)
+    logged_rows = 0
+    try:
+        while True:
+            question = input("Enter Question (or 'exit' to quit): ")
+            if question.lower() == 'exit':
+                break
+            try:
+                references, response = generate_answer_from_vector_db(retriever, user_question=question, max_images=max_images, openai_client=openai_client)
+                print(f"References:\n{references}\nResponse:\n{response}")
+                # Log the question, response, and references
+                worksheet.append([question, response, references])
+                logged_rows += 1
+            except Exception as e:
+                logger.error("Error generating answer: %s", e)
+                continue
+    finally:
+        # Save the logged rows of the whole session to Excel
         try:
-            references, response = generate_answer_from_vector_db(retriever, user_question=question, max_images=max_images, openai_client=openai_client)
-            print(f"References:\n{references}\nResponse:\n{response}")
-            # Log the question, response, and references
-            log_data.append({
-                'Question': question,
-                'Response': response,
-                'References': references
-            })
+            if logged_rows:
+                workbook.save(excelfile_full_path)
+                logger.info("Saved %d results to %s.", logged_rows, output_excel_file_name)
+            else:
+                logger.warning("No data to log.")
         except Exception as e:
-            logger.error(f"Error generating answer: {e}")
-            continue
-        # Save the logged data to Excel after each question
-        log_to_excel(log_data, output_folder,output_excel_file_name)
-        log_data = []  # Reset the log_data list
+            logger.error("Error logging data to Excel: %s", e)
+        finally:
+            workbook.close()
 
 def main():
     """
@@ -141,23 +205,16 @@ def main():
         vector_db_persist_directory=vector_db_persist_directory
     )
 
-    # Initialize the text splitter
-    text_chunker = RecursiveCharacterTextSplitter(
-        chunk_size=config["text_splitter"]["chunk_size"],
-        chunk_overlap=config["text_splitter"]["chunk_overlap"],
-        length_function=len,
-        is_separator_regex=False
-    )
-
     # Create retriever instance
     retriever = create_retriever(vector_db, search_type=retriever_search_algorithm_name, top_k=retriver_top_k)
 
     # Process all PDFs in the specified folder
     try:
-        process_all_files(data_folder, vector_db, openai_client, multimodel_model_name, text_chunker=text_chunker)
+        install_uvloop()
+        asyncio.run(ingest_files(data_folder, vector_db, multimodel_model_name))
         
     except Exception as e:
-        logger.error(f"Error processing files: {e}")
+        logger.error("Error processing files: %s", e)
 
     # Start asking questions
     ask_question(retriever=retriever, openai_client=openai_client, max_images=retriver_max_images,output_folder =output_folder , output_excel_file_name=output_excel_file_name)
@@ -27,6 +27,9 @@ def context_extractor(similar_docs: List[Document], MAX_IMAGES: int) -> Tuple[st
     
     # Retrieve the OpenAI model, defaulting to "gpt-3.5-turbo" if not set
     model_name = config["openai"].get("openai_only_text_model", "gpt-3.5-turbo") or "gpt-3.5-turbo"
+
+    # Retrieve the OpenAI model used when images are present, defaulting to "gpt-4o" if not set
+    image_model_name = config["openai"].get("openai_text_image_model", "gpt-4o") or "gpt-4o"
     
     references = {
         "text": [],  # To store the first text reference
@@ -53,8 +56,7 @@ def context_extractor(similar_docs: List[Document], MAX_IMAGES: int) -> Tuple[st
                         references["image"].append({"pdf_name": pdf_name, "page_no": page_no})
                         first_image_reference_found = True
 
-                    # Retrieve the OpenAI model, defaulting to "gpt-4o" if not set
-                    model_name = config["openai"].get("openai_text_image_model", "gpt-4o") or "gpt-4o"
+                    model_name = image_model_name
 
             elif doc_type == "Text":
                 context += doc.page_content + "\n"
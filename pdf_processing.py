@@ -3,7 +3,7 @@
 import pdfplumber
 from logging_config import logger
 from typing import Any,List,Tuple
-from vector_database import text_db_insetter,image_db_insetter
+from vector_database import DocumentBatcher,text_db_insetter,image_db_insetter
 from image_processing import encode_image_base64
 import fitz
 import os
@@ -66,13 +66,13 @@ def extract_images_from_page(page_data: Any, pdf_name: str, page_no: int) -> Lis
     return images
 
 
-def PDF_text_processor(pdf_path: str, vector_db: Any, text_chunker: Any) -> None:
+def PDF_text_processor(pdf_path: str, batcher: DocumentBatcher, text_chunker: Any) -> None:
     """
     Extracts text from a PDF, splits it into smaller chunks, and inserts the chunks into a vector database.
 
     Args:
         pdf_path (str): The path to the PDF file.
-        vector_db (Any): An instance of the vector database to which documents will be added.
+        batcher (DocumentBatcher): The batcher that buffers documents for the vector database.
         text_chunker (Any): An instance of the text splitter to use for splitting the text.
 
     Raises:
@@ -89,19 +89,19 @@ def PDF_text_processor(pdf_path: str, vector_db: Any, text_chunker: Any) -> None
             for page_num, page in enumerate(pdf.pages, start=1):
                 extracted_text = extract_text_from_page(page_data=page, pdf_name=pdf_path, page_no=page_num)
                 split_texts = text_splitter(text=extracted_text,text_chunker=text_chunker)
-                text_db_insetter(vector_db=vector_db, texts=split_texts, pdf_name=pdf_path, page_no=page_num)
+                text_db_insetter(batcher=batcher, texts=split_texts, pdf_name=pdf_path, page_no=page_num)
     except Exception as e:
         logger.error(f"Error processing PDF: '{pdf_path}'. Error: {e}")
         raise Exception(f"Failed to process PDF: '{pdf_path}'.") from e
 
-def PDF_image_processor(pdf_path: str, output_folder: str, vector_db: Any, openai_client: Any, model_name: str, text_chunker: Any) -> None:
+def PDF_image_processor(pdf_path: str, output_folder: str, batcher: DocumentBatcher, openai_client: Any, model_name: str, text_chunker: Any) -> None:
     """
     Processes images from a PDF file, generates summaries, and inserts them into a vector database.
 
     Args:
         pdf_path (str): The path to the PDF file.
         output_folder (str): The folder where extracted images will be saved.
-        vector_db (Any): An instance of the vector database to which documents will be added.
+        batcher (DocumentBatcher): The batcher that buffers documents for the vector database.
         openai_client (Any): An instance of the OpenAI client to interact with the API.
         model_name (str): The name of the OpenAI model to use for generating summaries.
         text_chunker (Any): An instance of the text splitter to use for splitting text summaries.
@@ -119,17 +119,18 @@ def PDF_image_processor(pdf_path: str, output_folder: str, vector_db: Any, opena
     logger.info(f"Processing PDF for image summaries: '{pdf_path}'")
 
     try:
+        pdf_name = os.path.basename(pdf_path)
         document = fitz.open(pdf_path)
         for page_num in range(document.page_count):
             page = document[page_num]
-            images = extract_images_from_page(page_data=page, pdf_name=os.path.basename(pdf_path), page_no=page_num+1)
+            images = extract_images_from_page(page_data=page, pdf_name=pdf_name, page_no=page_num+1)
 
             for img_index, img in enumerate(images):
                 xref = img[0]
                 base_image = document.extract_image(xref)
                 image_bytes = base_image["image"]
                 image_ext = base_image["ext"]
-                image_filename = f"{output_folder}/{os.path.basename(pdf_path)}_page_{page_num + 1}_image_{img_index + 1}.{image_ext}"
+                image_filename = f"{output_folder}/{pdf_name}_page_{page_num + 1}_image_{img_index + 1}.{image_ext}"
 
                 # Save the extracted image
                 with open(image_filename, "wb") as image_file:
@@ -148,20 +149,20 @@ def PDF_image_processor(pdf_path: str, output_folder: str, vector_db: Any, opena
                 logger.info(f"Successfully split image summary into chunks for image: {image_filename}")
 
                 # Insert the split image summaries into the vector database
-                image_db_insetter(vector_db, split_summaries, image_filename, os.path.basename(pdf_path), page_no = page_num + 1 )
+                image_db_insetter(batcher, split_summaries, image_filename, pdf_name, page_no = page_num + 1 )
                 logger.info(f"Successfully inserted image summary chunks into vector database for image: {image_filename}")
 
     except Exception as e:
         logger.error(f"Error processing PDF: '{pdf_path}'. Error: {e}")
         raise Exception(f"Failed to process PDF: '{pdf_path}'.") from e
-def process_pdf(pdf_path: str, output_folder: str, vector_db: Any, openai_client: Any, model_name: str, text_chunker: Any) -> None:
+def process_pdf(pdf_path: str, output_folder: str, batcher: DocumentBatcher, openai_client: Any, model_name: str, text_chunker: Any) -> None:
     """
     Processes a single PDF file using the PDF_image_processor and PDF_text_processor.
 
     Args:
         pdf_path (str): The path to the PDF file.
         output_folder (str): The folder where extracted images will be saved.
-        vector_db (Any): An instance of the vector database to which documents will be added.
+        batcher (DocumentBatcher): The batcher that buffers documents for the vector database.
         openai_client (Any): An instance of the OpenAI client to interact with the API.
         model_name (str): The name of the OpenAI model to use for generating summaries.
         text_chunker (Any): An instance of the text splitter to use for splitting text.
@@ -169,7 +170,7 @@ def process_pdf(pdf_path: str, output_folder: str, vector_db: Any, openai_client
     logger.info(f"Processing PDF file: {pdf_path}")
             
     try:
-        PDF_text_processor(pdf_path, vector_db, text_chunker)
-        PDF_image_processor(pdf_path, output_folder, vector_db, openai_client, model_name, text_chunker)
+        PDF_text_processor(pdf_path, batcher, text_chunker)
+        PDF_image_processor(pdf_path, output_folder, batcher, openai_client, model_name, text_chunker)
     except Exception as e:
         logger.error(f"Error processing PDF file '{pdf_path}': {e}")
\ No newline at end of file
@@ -1,5 +1,7 @@
 from typing import Any, List
 import json
+import re
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 from logging_config import logger
 
 def text_splitter(text: str, text_chunker: Any) -> List[str]:
@@ -25,6 +27,101 @@ def text_splitter(text: str, text_chunker: Any) -> List[str]:
         raise Exception(f"An error occurred while splitting the text: {e}")
     return splited_text
 
+class CompiledSeparatorTextSplitter(RecursiveCharacterTextSplitter):
+    """
+    A recursive character text splitter that compiles its literal separators once.
+
+    The base splitter escapes and regex-searches every separator on each recursive call.
+    This splitter checks for literal separators with a substring test and splits with
+    patterns compiled at construction, producing the same chunks.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        pattern_format = "({})" if self._keep_separator else "{}"
+        self._sep_patterns = {
+            separator: re.compile(pattern_format.format(re.escape(separator)))
+            for separator in self._separators if separator
+        }
+
+    def _split_on_separator(self, text: str, separator: str) -> List[str]:
+        """
+        Splits text on a literal separator, placing the separator as configured by keep_separator.
+
+        Args:
+            text (str): The text to split.
+            separator (str): The separator to split on; an empty separator splits into characters.
+
+        Returns:
+            List[str]: The non-empty pieces of the text.
+        """
+        if not separator:
+            splits = list(text)
+        elif not self._keep_separator:
+            splits = self._sep_patterns[separator].split(text)
+        else:
+            # The pattern captures the separator, so pieces and separators alternate
+            _splits = self._sep_patterns[separator].split(text)
+            if self._keep_separator == "end":
+                splits = [_splits[i] + _splits[i + 1] for i in range(0, len(_splits) - 1, 2)] + [_splits[-1]]
+            else:
+                splits = [_splits[0]] + [_splits[i] + _splits[i + 1] for i in range(1, len(_splits), 2)]
+        return [s for s in splits if s != ""]
+
+    def _split_text(self, text: str, separators: List[str]) -> List[str]:
+        if self._is_separator_regex:
+            return super()._split_text(text, separators)
+
+        # Use the first separator present in the text
+        separator = separators[-1]
+        new_separators = []
+        for i, _s in enumerate(separators):
+            if _s == "":
+                separator = _s
+                break
+            if _s in text:
+                separator = _s
+                new_separators = separators[i + 1:]
+                break
+
+        splits = self._split_on_separator(text, separator)
+
+        # Merge the small pieces and recursively split the ones that are too long
+        final_chunks = []
+        good_splits = []
+        merge_separator = "" if self._keep_separator else separator
+        for s in splits:
+            if self._length_function(s) < self._chunk_size:
+                good_splits.append(s)
+            else:
+                if good_splits:
+                    final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+                    good_splits = []
+                if not new_separators:
+                    final_chunks.append(s)
+                else:
+                    final_chunks.extend(self._split_text(s, new_separators))
+        if good_splits:
+            final_chunks.extend(self._merge_splits(good_splits, merge_separator))
+        return final_chunks
+
+def build_text_chunker(chunker_config: dict) -> RecursiveCharacterTextSplitter:
+    """
+    Builds the text splitter used to chunk extracted text.
+
+    Args:
+        chunker_config (dict): The text splitter settings, containing 'chunk_size' and 'chunk_overlap'.
+
+    Returns:
+        RecursiveCharacterTextSplitter: The configured text splitter.
+    """
+    return CompiledSeparatorTextSplitter(
+        chunk_size=chunker_config["chunk_size"],
+        chunk_overlap=chunker_config["chunk_overlap"],
+        length_function=len,
+        is_separator_regex=False
+    )
+
 def load_config(config_path='config.json'):
     """
     Load configuration settings from a JSON file.
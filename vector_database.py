@@ -1,15 +1,474 @@
 from langchain.schema import Document
-from typing import Any, List
+from typing import Any, List, Set, Tuple
+import asyncio
+import hashlib
 import os
+from collections import OrderedDict
+import numpy as np
+from chromadb.db.impl.sqlite import SqliteDB
+from langchain_chroma import Chroma
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.faiss import dependable_faiss_import
 from logging_config import logger
 from utilities import config
 
-def image_db_insetter(vector_db: Any, image_summaries_texts: List[str], image_path: str, pdf_name: str, page_no: int) -> None:
+# Maximum number of records written to the Chroma collection per add call
+CHROMA_INSERT_BATCH_SIZE = 100
+
+# Maximum number of inputs accepted by a single OpenAI embeddings request
+OPENAI_EMBEDDING_MAX_INPUTS = 2048
+
+# Maximum number of questions whose retrieved documents are cached
+RETRIEVAL_CACHE_SIZE = 128
+
+# Retrieved documents keyed by (retriever id, corpus version, normalized question), in least recently used order
+_retrieval_cache: "OrderedDict[tuple, List[Document]]" = OrderedDict()
+
+# Incremented whenever documents are added, so cached retrievals of an older corpus are never returned
+_corpus_version = 0
+
+# SQLite settings that avoid a synchronous commit per write; the index can be rebuilt from the source files
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+)
+
+def apply_sqlite_pragmas(client: Any) -> None:
+    """
+    Applies write-friendly SQLite pragmas to the database behind a Chroma persistent client.
+
+    Args:
+        client (Any): The Chroma persistent client whose SQLite database will be tuned.
+    """
+    try:
+        connection = client._system.instance(SqliteDB)._conn_pool.connect()
+        for pragma in SQLITE_PRAGMAS:
+            connection.execute(pragma)
+        logger.info("Applied SQLite pragmas to the vector database.")
+    except Exception as e:
+        # The pragmas rely on Chroma internals, so failing to apply them is not fatal
+        logger.warning("Could not apply SQLite pragmas to the vector database: %s", str(e))
+
+class ChromaVectorStore(Chroma):
+    """
+    A Chroma vector store that accepts documents embedded outside of it.
+    """
+
+    def existing_ids(self, ids: List[str]) -> Set[str]:
+        """
+        Returns the ids among the given ones that are already stored.
+
+        Args:
+            ids (List[str]): The document ids to look up.
+
+        Returns:
+            Set[str]: The ids already present in the collection.
+        """
+        return set(self._collection.get(ids=ids, include=[])["ids"])
+
+    def add_embedded_documents(self, ids: List[str], texts: List[str], embeddings: List[List[float]], metadatas: List[dict]) -> None:
+        """
+        Writes documents and their precomputed embeddings to the collection.
+
+        Args:
+            ids (List[str]): The document ids.
+            texts (List[str]): The document texts.
+            embeddings (List[List[float]]): The embeddings of the texts.
+            metadatas (List[dict]): The document metadata.
+        """
+        for start in range(0, len(ids), CHROMA_INSERT_BATCH_SIZE):
+            end = start + CHROMA_INSERT_BATCH_SIZE
+            self._collection.add(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=texts[start:end],
+                metadatas=metadatas[start:end]
+            )
+
+    def persist(self) -> None:
+        """
+        Does nothing; the persistent client writes every add to disk.
+        """
+
+class FaissVectorStore(FAISS):
+    """
+    A FAISS vector store whose index is built from a FAISS index factory string.
+
+    Trained indexes such as IVF-PQ need sample vectors before anything can be added, so
+    embedded documents are held back until train_size of them are available (or the store
+    is persisted) and the index is trained on them. If there are too few vectors to train
+    the requested index, the fallback index is used instead; once the store grows to
+    train_size vectors, the fallback index is rebuilt as the requested index.
+
+    Args:
+        embedding_function (Any): The embeddings used to embed queries.
+        index (Any): An existing FAISS index, or None to build one on the first training. Defaults to None.
+        docstore (Any): The docstore holding the documents. Defaults to an empty InMemoryDocstore.
+        index_to_docstore_id (dict): Maps index positions to document ids. Defaults to an empty dict.
+        index_factory (str): The FAISS index factory string. Defaults to "IVF4096,PQ64".
+        fallback_index_factory (str): The FAISS index factory string used when the index cannot be trained. Defaults to "Flat".
+        train_size (int): The number of vectors to collect before training the index. Defaults to 100000.
+        nprobe (int): The number of inverted lists searched per query for IVF indexes. Defaults to 16.
+        persist_directory (str): The folder the index and docstore are saved to. Defaults to None.
+    """
+
+    def __init__(self, embedding_function: Any, index: Any = None, docstore: Any = None, index_to_docstore_id: dict = None,
+                 index_factory: str = "IVF4096,PQ64", fallback_index_factory: str = "Flat", train_size: int = 100000, nprobe: int = 16, persist_directory: str = None, **kwargs: Any) -> None:
+        super().__init__(embedding_function, index, docstore if docstore is not None else InMemoryDocstore({}), index_to_docstore_id if index_to_docstore_id is not None else {}, **kwargs)
+        self.index_factory = index_factory
+        self.fallback_index_factory = fallback_index_factory
+        self.train_size = train_size
+        self.nprobe = nprobe
+        self.persist_directory = persist_directory
+        # Batches of (ids, texts, float32 vectors, metadatas) held back until the index is trained
+        self._untrained_documents = []
+        self._untrained_count = 0
+        self._is_fallback = False
+        if self.index is not None:
+            self._is_fallback = self._is_fallback_index()
+            self._configure_index()
+
+    @classmethod
+    def load_or_create(cls, embedding_function: Any, persist_directory: str, **kwargs: Any) -> "FaissVectorStore":
+        """
+        Loads the store saved in the persist directory, or creates an empty one if none was saved.
+
+        Args:
+            embedding_function (Any): The embeddings used to embed queries.
+            persist_directory (str): The folder the index and docstore are saved to.
+            **kwargs (Any): Further FaissVectorStore settings.
+
+        Returns:
+            FaissVectorStore: The loaded or newly created store.
+        """
+        if os.path.exists(os.path.join(persist_directory, "index.faiss")):
+            logger.info("Loading FAISS index from %s.", persist_directory)
+            # The docstore pickle is written by this application
+            return cls.load_local(persist_directory, embedding_function, allow_dangerous_deserialization=True, persist_directory=persist_directory, **kwargs)
+        return cls(embedding_function, persist_directory=persist_directory, **kwargs)
+
+    def existing_ids(self, ids: List[str]) -> Set[str]:
+        """
+        Returns the ids among the given ones that are already stored.
+
+        Args:
+            ids (List[str]): The document ids to look up.
+
+        Returns:
+            Set[str]: The ids already present in the docstore.
+        """
+        return {document_id for document_id in ids if document_id in self.docstore._dict}
+
+    def add_embedded_documents(self, ids: List[str], texts: List[str], embeddings: List[List[float]], metadatas: List[dict]) -> None:
+        """
+        Adds documents and their precomputed embeddings to the index, training it first if needed.
+
+        Args:
+            ids (List[str]): The document ids.
+            texts (List[str]): The document texts.
+            embeddings (List[List[float]]): The embeddings of the texts.
+            metadatas (List[dict]): The document metadata.
+        """
+        if self.index is None:
+            # Hold the vectors as float32 rather than lists of Python floats
+            self._untrained_documents.append((ids, texts, np.asarray(embeddings, dtype=np.float32), metadatas))
+            self._untrained_count += len(ids)
+            if self._untrained_count >= self.train_size:
+                self._train_index()
+            return
+        self.add_embeddings(list(zip(texts, embeddings)), metadatas=metadatas, ids=ids)
+        if self._is_fallback and self.index.ntotal >= self.train_size:
+            self._rebuild_index()
+
+    def persist(self) -> None:
+        """
+        Trains the index on any documents still waiting for it and saves the index and docstore.
+        """
+        if self.index is None and self._untrained_documents:
+            self._train_index()
+        if self.index is not None and self.persist_directory:
+            self.save_local(self.persist_directory)
+            logger.info("Saved FAISS index to %s.", self.persist_directory)
+
+    def _train_index(self) -> None:
+        """
+        Builds and trains the index on the held back documents, then adds them to it.
+        """
+        batches, self._untrained_documents = self._untrained_documents, []
+        self._untrained_count = 0
+        vectors = np.concatenate([batch_vectors for _, _, batch_vectors, _ in batches])
+
+        self.index, self._is_fallback = self._build_index(vectors)
+        self._configure_index()
+        for ids, texts, batch_vectors, metadatas in batches:
+            self.add_embeddings(list(zip(texts, batch_vectors)), metadatas=metadatas, ids=ids)
+
+    def _rebuild_index(self) -> None:
+        """
+        Replaces the fallback index with the requested index, trained on the vectors stored so far.
+
+        The vectors are reconstructed from the fallback index and added back in the same
+        order, so the mapping from index positions to document ids stays valid.
+        """
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        index, is_fallback = self._build_index(vectors)
+        if is_fallback:
+            # Still too few vectors for the index factory; keep the current index and retry at twice the size
+            self.train_size = self.index.ntotal * 2
+            return
+        index.add(vectors)
+        self.index, self._is_fallback = index, False
+        self._configure_index()
+        logger.info("Rebuilt FAISS index as '%s' on %d vectors.", self.index_factory, len(vectors))
+
+    def _build_index(self, vectors: np.ndarray) -> Tuple[Any, bool]:
+        """
+        Builds an index with the index factory and trains it, falling back to the fallback index factory if training fails.
+
+        Args:
+            vectors (np.ndarray): The vectors to train the index on.
+
+        Returns:
+            Tuple[Any, bool]: The trained, empty index and whether it is the fallback index.
+        """
+        faiss = dependable_faiss_import()
+        index = faiss.index_factory(vectors.shape[1], self.index_factory)
+        is_fallback = False
+        try:
+            index.train(vectors)
+        except RuntimeError as e:
+            logger.warning("Could not train FAISS index '%s' on %d vectors, using '%s' instead: %s", self.index_factory, len(vectors), self.fallback_index_factory, str(e))
+            index = faiss.index_factory(vectors.shape[1], self.fallback_index_factory)
+            index.train(vectors)
+            is_fallback = True
+        logger.info("Trained FAISS index on %d vectors.", len(vectors))
+        return index, is_fallback
+
+    def _is_fallback_index(self) -> bool:
+        """
+        Checks whether the current index was built with the fallback index factory rather than the index factory.
+
+        Returns:
+            bool: True if the index type differs from the one the index factory builds.
+        """
+        faiss = dependable_faiss_import()
+        return type(self.index) is not type(faiss.index_factory(self.index.d, self.index_factory))
+
+    def _configure_index(self) -> None:
+        """
+        Sets the number of inverted lists searched per query and enables vector reconstruction, if the index has inverted lists.
+
+        Maximal marginal relevance search reconstructs the stored vectors, which IVF indexes
+        only support once their direct map has been built.
+        """
+        faiss = dependable_faiss_import()
+        ivf_index = faiss.try_extract_index_ivf(self.index)
+        if ivf_index is None:
+            return
+        faiss.ParameterSpace().set_index_parameter(self.index, "nprobe", self.nprobe)
+        ivf_index.make_direct_map()
+
+async def embed_texts(openai_client: Any, embedding_model_name: str, texts: List[str], semaphore: asyncio.Semaphore) -> List[List[float]]:
     """
-    Inserts image summary documents into a vector database.
+    Embeds texts with the OpenAI embeddings API, sending as many texts per request as the API allows.
+
+    Requests are issued concurrently; the semaphore bounds how many are in flight at once.
 
     Args:
-        vector_db (Any): An instance of the vector database to which documents will be added.
+        openai_client (Any): An instance of the asynchronous OpenAI client to interact with the API.
+        embedding_model_name (str): The name of the OpenAI embedding model.
+        texts (List[str]): The texts to embed.
+        semaphore (asyncio.Semaphore): The semaphore limiting concurrent embedding requests.
+
+    Returns:
+        List[List[float]]: The embeddings, in the same order as the texts.
+    """
+    async def _embed_chunk(chunk: List[str]) -> List[List[float]]:
+        async with semaphore:
+            response = await openai_client.embeddings.create(model=embedding_model_name, input=chunk)
+        return [item.embedding for item in response.data]
+
+    chunks = [texts[start:start + OPENAI_EMBEDDING_MAX_INPUTS] for start in range(0, len(texts), OPENAI_EMBEDDING_MAX_INPUTS)]
+    results = await asyncio.gather(*[_embed_chunk(chunk) for chunk in chunks])
+    return [embedding for chunk_embeddings in results for embedding in chunk_embeddings]
+
+def content_hash(text: str) -> str:
+    """
+    Computes the 128-bit BLAKE2b hash of a text, used as its document id in the vector database.
+
+    Args:
+        text (str): The text to hash.
+
+    Returns:
+        str: The hexadecimal digest of the text.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+class DocumentBatcher:
+    """
+    Buffers documents and inserts them into a vector database in batches.
+
+    Adding documents one page at a time costs one embedding round-trip and one
+    database transaction per page; buffering them amortizes that overhead.
+    Documents are embedded directly through the asynchronous OpenAI client, with
+    several batches in flight at once, and written to the vector store together
+    with their embeddings.
+    Documents are identified by the hash of their content, so repeated text such as
+    headers and footers is embedded only once, and documents already stored by an
+    earlier run are skipped.
+    A batcher created without a vector database only collects documents, which is
+    how worker processes hand their documents back to the parent process.
+
+    Args:
+        vector_db (Any): The ChromaVectorStore or FaissVectorStore the documents are written to. Defaults to None.
+        openai_client (Any): An instance of the asynchronous OpenAI client used to embed the documents. Defaults to None.
+        embedding_model_name (str): The name of the OpenAI embedding model. Defaults to None.
+        batch_size (int): The number of documents to insert per call. Defaults to 200.
+        max_concurrency (int): The maximum number of embedding requests in flight. Defaults to 12.
+    """
+
+    def __init__(self, vector_db: Any = None, openai_client: Any = None, embedding_model_name: str = None, batch_size: int = 200, max_concurrency: int = 12) -> None:
+        if batch_size < 1:
+            raise ValueError("Batch size must be a positive integer.")
+        if max_concurrency < 1:
+            raise ValueError("Maximum concurrency must be a positive integer.")
+        self.vector_db = vector_db
+        self.openai_client = openai_client
+        self.embedding_model_name = embedding_model_name
+        self.batch_size = batch_size
+        self.documents: List[Document] = []
+        self._seen_hashes = set()
+        self._max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._pending: List[asyncio.Task] = []
+
+    def extend(self, documents: List[Document]) -> None:
+        """
+        Adds documents to the buffer, skipping any whose content has already been added.
+
+        Args:
+            documents (List[Document]): The documents to buffer.
+        """
+        for document in documents:
+            document_hash = content_hash(document.page_content)
+            if document_hash in self._seen_hashes:
+                continue
+            self._seen_hashes.add(document_hash)
+            self.documents.append(document)
+
+    async def flush_if_full(self) -> None:
+        """
+        Starts inserting every full batch in the buffer without waiting for the inserts to finish.
+
+        Only waits when more batches are in flight than the maximum concurrency, so that
+        documents cannot pile up faster than they are embedded. The remaining inserts are awaited by flush.
+
+        Raises:
+            ValueError: If the batcher has no vector database.
+            Exception: If an insert started earlier has failed.
+        """
+        self._check_finished()
+        while len(self.documents) >= self.batch_size:
+            self._start_batch()
+        while len(self._pending) > self._max_concurrency:
+            await asyncio.wait(self._pending, return_when=asyncio.FIRST_COMPLETED)
+            self._check_finished()
+
+    def _check_finished(self) -> None:
+        """
+        Drops finished inserts from the pending inserts, raising the error of the first one that failed.
+
+        The inserts still running are cancelled when one has failed, and the inserts that
+        succeeded are persisted.
+
+        Raises:
+            Exception: If a finished insert failed.
+        """
+        finished = [task for task in self._pending if task.done()]
+        self._pending = [task for task in self._pending if not task.done()]
+        errors = [task.exception() for task in finished if task.exception() is not None]
+        if errors:
+            for task in self._pending:
+                task.cancel()
+            self._pending = []
+            self._persist()
+            raise Exception(f"An error occurred while adding documents to the vector database: {errors[0]}")
+
+    async def flush(self) -> None:
+        """
+        Inserts all buffered documents, waits for every pending insert to finish, and persists the vector store.
+
+        The vector store is persisted even if some inserts failed, so the documents that were
+        inserted are kept and skipped by the next run.
+
+        Raises:
+            ValueError: If the batcher has no vector database.
+            Exception: If there is an error while adding documents to the vector database.
+        """
+        while self.documents:
+            self._start_batch()
+        pending, self._pending = self._pending, []
+        try:
+            results = await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            self._persist()
+        for result in results:
+            if isinstance(result, Exception):
+                raise Exception(f"An error occurred while adding documents to the vector database: {result}")
+
+    def _persist(self) -> None:
+        """
+        Persists the vector store, if any, and invalidates cached retrievals.
+        """
+        global _corpus_version
+        if self.vector_db is not None:
+            self.vector_db.persist()
+            _corpus_version += 1
+
+    def _start_batch(self) -> None:
+        """
+        Removes the next batch from the buffer and schedules its insertion.
+        """
+        if self.vector_db is None:
+            raise ValueError("The batcher has no vector database to flush documents into.")
+        batch = self.documents[:self.batch_size]
+        del self.documents[:self.batch_size]
+        self._pending.append(asyncio.create_task(self._insert_batch(batch)))
+
+    async def _insert_batch(self, batch: List[Document]) -> None:
+        """
+        Embeds a batch of documents and writes it to the vector store.
+
+        Documents whose content hash is already stored in the vector store are skipped.
+
+        Args:
+            batch (List[Document]): The documents to insert.
+        """
+        global _corpus_version
+        ids = [content_hash(document.page_content) for document in batch]
+        existing_ids = self.vector_db.existing_ids(ids)
+        if existing_ids:
+            logger.info("Skipping %d documents already in the vector database.", len(existing_ids))
+            batch = [document for document, document_id in zip(batch, ids) if document_id not in existing_ids]
+            ids = [document_id for document_id in ids if document_id not in existing_ids]
+        if not batch:
+            return
+
+        texts = [document.page_content for document in batch]
+        metadatas = [document.metadata for document in batch]
+        embeddings = await embed_texts(self.openai_client, self.embedding_model_name, texts, self._semaphore)
+        self.vector_db.add_embedded_documents(ids, texts, embeddings, metadatas)
+        _corpus_version += 1
+        logger.info("Inserted %d documents into the vector database.", len(batch))
+
+def image_db_insetter(batcher: DocumentBatcher, image_summaries_texts: List[str], image_path: str, pdf_name: str, page_no: int) -> None:
+    """
+    Queues image summary documents for batched insertion into a vector database.
+
+    Args:
+        batcher (DocumentBatcher): The batcher that buffers documents for the vector database.
         image_summaries_texts (List[str]): A list of summary texts for the images to be added as documents.
         image_path (str): The file path of the image being processed.
         pdf_name (str): The name of the PDF source for the documents.
@@ -17,58 +476,58 @@ def image_db_insetter(vector_db: Any, image_summaries_texts: List[str], image_pa
 
     Raises:
         ValueError: If the image summaries list is empty or if the page number is invalid.
-        Exception: If there is an error while adding documents to the vector database.
     """
     if not image_summaries_texts:
         raise ValueError("The image summaries list cannot be empty.")
     if page_no < 1:
         raise ValueError("Page number must be a positive integer.")
     
-    documents = []
-    for text in image_summaries_texts:
-        documents.append(Document(page_content=text, metadata={
-            "Source": os.path.basename(pdf_name),
-            "PageNo": page_no,
-            "ImagePath": image_path,
-            "Type": "Image"
-        }))
-    
-    try:
-        vector_db.add_documents(documents=documents)
-    except Exception as e:
-        raise Exception(f"An error occurred while adding documents to the vector database: {e}")
+    base_metadata = {
+        "Source": os.path.basename(pdf_name),
+        "PageNo": page_no,
+        "ImagePath": image_path,
+        "Type": "Image"
+    }
+    documents = [Document(page_content=text, metadata=base_metadata.copy()) for text in image_summaries_texts]
 
-def text_db_insetter(vector_db: Any, texts: List[str], pdf_name: str, page_no: int) -> None:
+    batcher.extend(documents)
+
+def text_db_insetter(batcher: DocumentBatcher, texts: List[str], pdf_name: str, page_no: int) -> None:
     """
-    Inserts text documents into a vector database.
+    Queues text documents for batched insertion into a vector database.
 
     Args:
-        vector_db (Any): An instance of the vector database to which documents will be added.
+        batcher (DocumentBatcher): The batcher that buffers documents for the vector database.
         texts (List[str]): A list of text strings to be added as documents.
         pdf_name (str): The name of the PDF source for the documents.
         page_no (int): The page number from which the texts were extracted.
 
     Raises:
         ValueError: If the texts list is empty or if the page number is invalid.
-        Exception: If there is an error while adding documents to the vector database.
     """
     if not texts:
         raise ValueError("The texts list cannot be empty.")
     if page_no < 1:
         raise ValueError("Page number must be a positive integer.")
     
-    documents = []
-    for text in texts:
-        documents.append(Document(page_content=text, metadata={
-            "Source": os.path.basename(pdf_name),
-            "PageNo": page_no,
-            "Type": "Text"
-        }))
-    
-    try:
-        vector_db.add_documents(documents=documents)
-    except Exception as e:
-        raise Exception(f"An error occurred while adding documents to the vector database: {e}")
+    base_metadata = {
+        "Source": os.path.basename(pdf_name),
+        "PageNo": page_no,
+        "Type": "Text"
+    }
+    documents = [Document(page_content=text, metadata=base_metadata.copy()) for text in texts]
+
+    batcher.extend(documents)
+
+def _retrieval_cache_key(retriever: Any, question: str) -> tuple:
+    """Builds the retrieval cache key for a question from the retriever, the corpus version, and the normalized question."""
+    return (id(retriever), _corpus_version, question.strip().lower())
+
+def _cache_retrieval(cache_key: tuple, documents: List[Document]) -> None:
+    """Stores retrieved documents in the cache, evicting the least recently used entry when full."""
+    _retrieval_cache[cache_key] = list(documents)
+    if len(_retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+        _retrieval_cache.popitem(last=False)
 
 def create_retriever(vector_db: Any, search_type: str, top_k: int) -> Any:
     """
@@ -89,6 +548,8 @@ def retrieve_documents(retriever: Any, question: str) -> List[Document]:
     """
     Retrieve documents based on a given question using the specified retriever.
 
+    Results are cached per retriever on the normalized question text until new documents are added.
+
     Args:
         retriever (Any): The retriever instance used to fetch documents.
         question (str): The question or query for which to retrieve documents.
@@ -105,11 +566,78 @@ def retrieve_documents(retriever: Any, question: str) -> List[Document]:
         logger.error("Invalid question provided: %s", question)
         raise ValueError("The question must be a non-empty string.")
     
+    cache_key = _retrieval_cache_key(retriever, question)
+    if cache_key in _retrieval_cache:
+        _retrieval_cache.move_to_end(cache_key)
+        logger.info("Using cached documents for question: %s", question)
+        return list(_retrieval_cache[cache_key])
+
     try:
         results = retriever.invoke(input=question)
         logger.info("Retrieved %d documents for question: %s", len(results), question)
-        
+
+        _cache_retrieval(cache_key, results)
         return results
     except Exception as e:
         logger.error("Error retrieving documents: %s", str(e))
         return []
+
+def retrieve_documents_batch(retriever: Any, questions: List[str]) -> List[List[Document]]:
+    """
+    Retrieve documents for several questions at once using the specified retriever.
+
+    All uncached questions are embedded in one request and searched in one Chroma query.
+    Retrievers using a search type other than similarity, or a vector store other than Chroma,
+    fall back to retrieve_documents per question.
+
+    Args:
+        retriever (Any): The retriever instance used to fetch documents.
+        questions (List[str]): The questions or queries for which to retrieve documents.
+
+    Returns:
+        List[List[Document]]: The documents retrieved for each question, in the same order as the questions.
+
+    Raises:
+        ValueError: If any question is empty or invalid.
+    """
+    # Input validation
+    for question in questions:
+        if not question or not isinstance(question, str):
+            logger.error("Invalid question provided: %s", question)
+            raise ValueError("The question must be a non-empty string.")
+
+    if retriever.search_type != "similarity" or not isinstance(retriever.vectorstore, Chroma):
+        return [retrieve_documents(retriever, question) for question in questions]
+
+    results: List[List[Document]] = [None] * len(questions)
+    missing = []
+    for index, question in enumerate(questions):
+        cache_key = _retrieval_cache_key(retriever, question)
+        if cache_key in _retrieval_cache:
+            _retrieval_cache.move_to_end(cache_key)
+            results[index] = list(_retrieval_cache[cache_key])
+        else:
+            missing.append(index)
+
+    if missing:
+        try:
+            vector_db = retriever.vectorstore
+            query_embeddings = vector_db.embeddings.embed_documents([questions[index] for index in missing])
+            query_results = vector_db._collection.query(
+                query_embeddings=query_embeddings,
+                n_results=retriever.search_kwargs.get("k", 4),
+                include=["documents", "metadatas"]
+            )
+        except Exception as e:
+            logger.error("Error retrieving documents: %s", str(e))
+            for index in missing:
+                results[index] = []
+            return results
+
+        for index, texts, metadatas in zip(missing, query_results["documents"], query_results["metadatas"]):
+            documents = [Document(page_content=text, metadata=metadata or {}) for text, metadata in zip(texts, metadatas)]
+            logger.info("Retrieved %d documents for question: %s", len(documents), questions[index])
+            _cache_retrieval(_retrieval_cache_key(retriever, questions[index]), documents)
+            results[index] = documents
+
+    return results
\ No newline at end of file
@@ -2,7 +2,7 @@ import os
 from typing import Any
 from langchain_community.document_loaders import Docx2txtLoader
 from logging_config import logger
-from vector_database import text_db_insetter
+from vector_database import DocumentBatcher, text_db_insetter
 from utilities import text_splitter
 
 def word_text_extracter(file_path: str) -> str:
@@ -36,12 +36,12 @@ def word_text_extracter(file_path: str) -> str:
         logger.error(f"Error loading document: '{file_path}'. Error: {e}")
         raise Exception(f"Failed to extract text from Word document: '{file_path}'.") from e
 
-def process_word_text(word_path: str, vector_db: Any, text_chunker: Any) -> None:
+def process_word_text(word_path: str, batcher: DocumentBatcher, text_chunker: Any) -> None:
     """Processes a Word document by extracting text, chunking it, and inserting it into a vector database.
 
     Args:
         word_path (str): The path to the Word document.
-        vector_db (Any): An instance of the vector database to which documents will be added.
+        batcher (DocumentBatcher): The batcher that buffers documents for the vector database.
         text_chunker (Any): An instance of the text splitter to use for splitting the text.
 
     Raises:
@@ -62,7 +62,7 @@ def process_word_text(word_path: str, vector_db: Any, text_chunker: Any) -> None
         # Extract the file name from the path
         file_name = os.path.basename(word_path)
 
-        text_db_insetter(vector_db=vector_db, texts=split_texts, pdf_name=file_name, page_no=1)
+        text_db_insetter(batcher=batcher, texts=split_texts, pdf_name=file_name, page_no=1)
         logger.info(f"Successfully processed and inserted chunks from '{file_name}' into the vector database.")
 
     except ValueError as ve: